@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from src.audit.store import AuditStore
+
+REPO_ROOT = Path(__file__).resolve().parent
+DEFAULT_STORE = str(REPO_ROOT / "logs" / "audit_store")
+
+
+def _load_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _filters(args: argparse.Namespace) -> Dict[str, Any]:
+    since = args.since
+    if args.last is not None:
+        since = time.time() - args.last
+    return {
+        "scope_key": args.scope,
+        "turn_id": args.turn_id,
+        "since": since,
+        "until": args.until,
+        "quarantine": True if args.quarantine else None,
+        "transitions_only": args.transitions,
+    }
+
+
+def _add_filter_args(p: argparse.ArgumentParser):
+    p.add_argument("--scope", help="scope_key, e.g. agent:NPC_1 or task:T1")
+    p.add_argument("--turn-id")
+    p.add_argument("--since", type=float, help="epoch seconds (inclusive)")
+    p.add_argument("--until", type=float, help="epoch seconds (inclusive)")
+    p.add_argument("--last", type=float, help="only records from the last N seconds (overrides --since)")
+    p.add_argument("--quarantine", action="store_true", help="only records whose decision quarantined")
+    p.add_argument("--transitions", action="store_true", help="only enter/exit events")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Indexed CDE audit store")
+    parser.add_argument("--store", default=DEFAULT_STORE, help=f"store directory (default: {DEFAULT_STORE})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_ingest = sub.add_parser("ingest", help="append flat JSONL logs (cde_audit / gateway_decisions) to the store")
+    p_ingest.add_argument("paths", nargs="+")
+    p_ingest.add_argument("--segment-max-records", type=int, default=5000)
+
+    p_query = sub.add_parser("query", help="print matching records as JSONL")
+    _add_filter_args(p_query)
+
+    p_export = sub.add_parser("export", help="write numeric fields as memory-mappable column files")
+    p_export.add_argument("out_dir")
+    _add_filter_args(p_export)
+
+    sub.add_parser("segments", help="list segments with their time range and scopes")
+
+    args = parser.parse_args()
+    try:
+        if args.cmd == "ingest":
+            n = 0
+            with AuditStore(args.store, segment_max_records=args.segment_max_records) as store:
+                for path in args.paths:
+                    for record in _load_jsonl(path):
+                        store.append(record)
+                        n += 1
+            sys.stderr.write(f"ingested {n} records into {args.store}\n")
+        elif args.cmd == "query":
+            store = AuditStore(args.store, read_only=True)
+            for record in store.query(**_filters(args)):
+                sys.stdout.write(json.dumps(record, separators=(",", ":")) + "\n")
+        elif args.cmd == "export":
+            schema = AuditStore(args.store, read_only=True).export_columns(args.out_dir, **_filters(args))
+            sys.stdout.write(json.dumps({"rows": schema["rows"], "columns": list(schema["columns"])}) + "\n")
+        elif args.cmd == "segments":
+            for seg in AuditStore(args.store, read_only=True).segments():
+                sys.stdout.write(json.dumps(seg) + "\n")
+        return 0
+    except Exception as exc:  # noqa: BLE001 - CLI needs broad failure handling
+        sys.stderr.write(f"audit_cli error: {exc}\n")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+import http.client, json, os, subprocess, sys, tempfile, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from .micro import _percentile
+from .synth import TurnGenerator
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _summarize(latencies_ms: List[float], wall_s: float, errors: int, concurrency: int) -> Dict[str, Any]:
+    lat = sorted(latencies_ms)
+    return {
+        "requests": len(lat) + errors,
+        "errors": errors,
+        "concurrency": concurrency,
+        "wall_s": wall_s,
+        "throughput_rps": (len(lat) / wall_s) if wall_s > 0 else 0.0,
+        "latency_ms_p50": _percentile(lat, 0.50),
+        "latency_ms_p95": _percentile(lat, 0.95),
+        "latency_ms_p99": _percentile(lat, 0.99),
+        "latency_ms_max": lat[-1] if lat else 0.0,
+    }
+
+
+def _drive(send: Callable[[Dict[str, Any]], None], payloads: List[Dict[str, Any]], concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(payload: Dict[str, Any]):
+        nonlocal errors
+        t0 = time.perf_counter()
+        try:
+            send(payload)
+        except Exception:  # noqa: BLE001 - counted, not fatal for a load run
+            with lock:
+                errors += 1
+            return
+        dt = (time.perf_counter() - t0) * 1000.0
+        with lock:
+            latencies.append(dt)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, payloads))
+    return _summarize(latencies, time.perf_counter() - t0, errors, concurrency)
+
+
+def _payloads(gen: TurnGenerator, requests: int, projection: str) -> List[Dict[str, Any]]:
+    out = []
+    for t in gen.turns(requests):
+        if projection != "full":
+            t["projection"] = projection
+        out.append(t)
+    return out
+
+
+def run_in_process(gen: TurnGenerator, requests: int = 500, concurrency: int = 4, projection: str = "full") -> Dict[str, Any]:
+    """Call cde_service.turn() directly from a thread pool (no HTTP/serialization)."""
+    import cde_service
+
+    cde_service.engines.clear()
+    return _drive(cde_service.turn, _payloads(gen, requests, projection), concurrency)
+
+
+def _free_port() -> int:
+    import socket
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(proc: "subprocess.Popen", port: int, timeout: float = 20.0):
+    deadline = time.time() + timeout
+    while True:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode} before serving")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1.0)
+            conn.request("GET", "/")
+            conn.getresponse().read()  # any status means the app is serving
+            conn.close()
+            return
+        except OSError:
+            if time.time() > deadline:
+                raise RuntimeError(f"uvicorn did not start on port {port} within {timeout:.0f}s")
+            time.sleep(0.05)
+
+
+def run_http(gen: TurnGenerator, requests: int = 500, concurrency: int = 4, projection: str = "full", port: int = 0) -> Dict[str, Any]:
+    """Start cde_service under uvicorn in its own process and POST /turn with keep-alive connections.
+
+    A separate process keeps the server off the client's GIL, so latencies are not
+    inflated by the load generator's own threads; each run starts with fresh engines.
+    """
+    port = port or _free_port()
+    cmd = [sys.executable, "-m", "uvicorn", "cde_service:app", "--host", "127.0.0.1", "--port", str(port),
+           "--log-level", "warning", "--no-access-log"]
+    env = dict(os.environ)
+    with tempfile.TemporaryFile() as server_log, tempfile.TemporaryDirectory(prefix="cde-bench-audit-") as audit_dir:
+        if env.get("CDE_AUDIT_STORE"):
+            # stores have a single writer, and an in-process run may already hold this one;
+            # the server still writes audit records, just to a store of its own
+            env["CDE_AUDIT_STORE"] = audit_dir
+        proc = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=server_log)
+        try:
+            try:
+                _wait_ready(proc, port)
+            except RuntimeError as exc:
+                server_log.seek(0)
+                tail = server_log.read()[-2000:].decode("utf-8", "replace").strip()
+                raise RuntimeError(f"{exc}\n{tail}" if tail else str(exc)) from None
+
+            local = threading.local()
+
+            def send(payload: Dict[str, Any]):
+                conn = getattr(local, "conn", None)
+                if conn is None:
+                    conn = local.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                # bytes (not str) so http.client sends headers+body in one write; avoids delayed-ACK stalls
+                body = json.dumps(payload).encode("utf-8")
+                conn.request("POST", "/turn", body=body, headers={"content-type": "application/json"})
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    raise RuntimeError(f"/turn returned {resp.status}")
+
+            payloads = _payloads(gen, requests, projection)
+            # the server process starts cold (imports, manifest cache); warm it on a session
+            # the timed payloads never use so their engine state is unchanged
+            for payload in payloads[:20]:
+                send(dict(payload, session_id="_bench_warmup"))
+            return _drive(send, payloads, concurrency)
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10.0)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
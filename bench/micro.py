@@ -0,0 +1,115 @@
+import time, tracemalloc
+from typing import Any, Callable, Dict, List
+
+from src.engine import CDEEngine
+from src.types.turn_packet import TurnPacket
+from src.extractors import lexical, pragmatic
+from src.baseline.retrieve import retrieve_manifest
+from src.compute.deviation import compute_deviation_vector
+from src.event.ema_hysteresis import EMAHysteresis
+from .synth import TurnGenerator
+
+
+def _packet(turn: Dict[str, Any]) -> TurnPacket:
+    payload = dict(turn)
+    payload.pop("session_id", None)
+    return TurnPacket.model_validate(payload)
+
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    i = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[i]
+
+
+def _time_once(fn: Callable[[int], Any], ops: int) -> float:
+    t0 = time.perf_counter_ns()
+    for i in range(ops):
+        fn(i)
+    return (time.perf_counter_ns() - t0) / ops
+
+
+def _summarize(per_op: List[float], ops: int) -> Dict[str, Any]:
+    per_op = sorted(per_op)
+    return {
+        "ops": ops,
+        "repeats": len(per_op),
+        "ns_per_op_median": _percentile(per_op, 0.5),
+        "ns_per_op_min": per_op[0],
+        "ns_per_op_max": per_op[-1],
+        "ns_per_op_p25": _percentile(per_op, 0.25),
+        "ns_per_op_p75": _percentile(per_op, 0.75),
+    }
+
+
+def time_cases(cases: Dict[str, Callable[[int], Any]], ops: int, repeats: int) -> Dict[str, Dict[str, Any]]:
+    """Time fn(i) for i in range(ops) per case, `repeats` rounds; report per-op ns stats.
+
+    Rounds are interleaved across cases so each case's min/max spread also reflects
+    machine drift over the whole run, not just back-to-back repeats.
+    """
+    for fn in cases.values():
+        for i in range(min(ops, 50)):  # warm caches / lazy imports
+            fn(i)
+    samples: Dict[str, List[float]] = {name: [] for name in cases}
+    for _ in range(repeats):
+        for name, fn in cases.items():
+            samples[name].append(_time_once(fn, ops))
+    return {name: _summarize(per_op, ops) for name, per_op in samples.items()}
+
+
+def alloc_per_op(fn: Callable[[int], Any], ops: int) -> float:
+    """Bytes still allocated per op when results are retained (tracemalloc)."""
+    fn(0)
+    keep = []
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    for i in range(ops):
+        keep.append(fn(i))
+    cur, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (cur - base) / max(ops, 1)
+
+
+def run(repo_root: str, gen: TurnGenerator, ops: int = 500, repeats: int = 5) -> Dict[str, Any]:
+    packets = [_packet(t) for t in gen.turns(ops)]
+    manifest, _ = retrieve_manifest(repo_root, "global")
+    # cases a tree does not support (older trees lack extract_record / evaluate_turn) are
+    # left out rather than timed through a stand-in; compare only reports shared cases
+    has_records = hasattr(lexical, "extract_record") and hasattr(pragmatic, "extract_record")
+    has_projections = hasattr(CDEEngine, "evaluate_turn")
+    if has_records:
+        layer_sets = [[lexical.extract_record(p), pragmatic.extract_record(p)] for p in packets]
+    else:
+        layer_sets = [[lexical.extract(p), pragmatic.extract(p)] for p in packets]
+    severities = [min(1.0, 0.1 * (i % 11)) for i in range(ops)]
+
+    def engine_turns(projection: str) -> Callable[[int], Any]:
+        engine = CDEEngine(repo_root)
+        return lambda i: engine.evaluate_turn(packets[i], projection=projection)
+
+    ema = EMAHysteresis(beta=manifest.ema_beta, theta_enter=manifest.theta_enter, alpha_exit=manifest.alpha_exit)
+    cases: Dict[str, Callable[[int], Any]] = {}
+    if has_records:
+        cases["extract.lexical.record"] = lambda i: lexical.extract_record(packets[i])
+    cases["extract.lexical.model"] = lambda i: lexical.extract(packets[i])
+    if has_records:
+        cases["extract.pragmatic.record"] = lambda i: pragmatic.extract_record(packets[i])
+    cases["extract.pragmatic.model"] = lambda i: pragmatic.extract(packets[i])
+    cases["compute_deviation_vector"] = lambda i: compute_deviation_vector(manifest, layer_sets[i])
+    cases["ema_hysteresis.step"] = lambda i: ema.step("global", severities[i])
+    cases["retrieve_manifest"] = lambda i: retrieve_manifest(repo_root, "global")
+    cases["process_turn"] = (lambda engine: (lambda i: engine.process_turn(packets[i])))(CDEEngine(repo_root))
+    if has_projections:
+        for projection in ("full", "top_event", "decision"):
+            cases[f"evaluate_turn.{projection}"] = engine_turns(projection)
+
+    results: Dict[str, Any] = time_cases(cases, ops, repeats)
+    # per extractor call and per whole turn; engines are warm from timing, so the turn
+    # cases measure steady-state retention rather than first-seen scope setup
+    for name in ("extract.lexical.record", "extract.lexical.model", "extract.pragmatic.record", "extract.pragmatic.model",
+                 "process_turn", "evaluate_turn.full", "evaluate_turn.top_event", "evaluate_turn.decision"):
+        if name in cases:
+            results[name]["alloc_bytes_per_op"] = alloc_per_op(cases[name], ops)
+    return results
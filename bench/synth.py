@@ -0,0 +1,69 @@
+import random
+from typing import Any, Dict, Iterator, List
+
+# signal-bearing fragments the extractors react to
+_CAPS = ["NOW", "STOP", "ASAP", "NEVER", "URGENT", "LISTEN"]
+_PUNCT = ["!!!", "???", "...", "!", "?"]
+_DEMANDS = ["do it now", "immediately", "right now", "you need to", "you must", "no excuses", "stop", "not asking"]
+_ULTIMATUMS = ["or else", "if you don't", "last chance"]
+_FILLER = ("please check the logs from today and summarize the deploy notes for the team "
+           "before we move on with the migration plan and review the diff").split()
+
+
+class TurnGenerator:
+    """Seeded synthetic turn packets (as dicts) for benchmarks.
+
+    text_len: target characters per turn
+    signal_density: probability [0,1] that each emitted fragment is a signal (caps/punct/demand/ultimatum)
+    sessions: number of distinct session_ids (and speakers)
+    scope_fanout: distinct task and scene ids per session, i.e. how many scope machines accumulate
+    """
+
+    def __init__(self, seed: int = 0, text_len: int = 120, signal_density: float = 0.1, sessions: int = 4, scope_fanout: int = 2):
+        self.rng = random.Random(seed)
+        self.text_len = int(text_len)
+        self.signal_density = float(signal_density)
+        self.sessions = max(1, int(sessions))
+        self.scope_fanout = max(1, int(scope_fanout))
+        self._n = 0
+
+    def _fragment(self) -> str:
+        rng = self.rng
+        if rng.random() >= self.signal_density:
+            return rng.choice(_FILLER)
+        kind = rng.random()
+        if kind < 0.3:
+            return rng.choice(_CAPS)
+        if kind < 0.5:
+            return rng.choice(_FILLER) + rng.choice(_PUNCT)
+        if kind < 0.85:
+            return rng.choice(_DEMANDS)
+        return rng.choice(_ULTIMATUMS)
+
+    def text(self) -> str:
+        parts: List[str] = []
+        size = 0
+        while size < self.text_len:
+            frag = self._fragment()
+            parts.append(frag)
+            size += len(frag) + 1
+        return " ".join(parts)[: max(self.text_len, 1)]
+
+    def turn(self) -> Dict[str, Any]:
+        rng = self.rng
+        self._n += 1
+        s = rng.randrange(self.sessions)
+        return {
+            "session_id": f"S{s}",
+            "turn_id": f"bench-{self._n}",
+            "ts": float(self._n),
+            "speaker_id": f"NPC_{s}",
+            "channel_id": f"ch{s}",
+            "task_id": f"T{rng.randrange(self.scope_fanout)}",
+            "scene_id": f"SC{rng.randrange(self.scope_fanout)}",
+            "text": self.text(),
+        }
+
+    def turns(self, n: int) -> Iterator[Dict[str, Any]]:
+        for _ in range(int(n)):
+            yield self.turn()
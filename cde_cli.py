@@ -2,7 +2,7 @@
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict
 
 from src.engine import CDEEngine
 from src.types.turn_packet import TurnPacket
@@ -16,24 +16,6 @@ def _model_dump(model: Any) -> Dict[str, Any]:
     return model.dict()  # pydantic v1
 
 
-def _scope_priority(scope_key: str) -> int:
-    if scope_key.startswith("scene:"):
-        return 4
-    if scope_key.startswith("task:"):
-        return 3
-    if scope_key.startswith("agent:"):
-        return 2
-    if scope_key == "global":
-        return 1
-    return 0
-
-
-def _choose_top_event(events: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    if not events:
-        return None
-    return max(events, key=lambda e: (_scope_priority(str(e.get("scope_key", ""))), float(e.get("severity", 0.0))))
-
-
 def main() -> int:
     try:
         raw = sys.stdin.read()
@@ -43,22 +25,29 @@ def main() -> int:
         if not isinstance(payload, dict):
             raise ValueError("input must be a JSON object")
 
+        # same projections as cde_service /turn: "full" (default), "top_event", "decision"
+        projection = str(payload.pop("projection", None) or "full")
+
         if hasattr(TurnPacket, "model_validate"):
             packet = TurnPacket.model_validate(payload)  # pydantic v2
         else:
             packet = TurnPacket.parse_obj(payload)  # pydantic v1
 
         engine = CDEEngine(repo_root=REPO_ROOT)
-        events = engine.process_turn(packet)
-        events_json = [_model_dump(e) for e in events]
-        top_event = _choose_top_event(events_json)
+        # top-event selection lives in the engine so this path agrees with cde_service
+        result = engine.evaluate_turn(packet, projection=projection)
+        events_json = [_model_dump(e) for e in result["events"]]
+        top_event = result["top_event"]
+        top_event_json = next((j for e, j in zip(result["events"], events_json) if e is top_event), None)
+        if top_event is not None and top_event_json is None:
+            top_event_json = _model_dump(top_event)
 
         out = {
             "events": events_json,
-            "top_event": top_event,
-            "decision": (top_event or {}).get("decision", {}),
-            "baseline_hash": (top_event or {}).get("baseline_hash"),
-            "extractor_versions": (top_event or {}).get("extractor_versions"),
+            "top_event": top_event_json,
+            "decision": result["decision"],
+            "baseline_hash": result["baseline_hash"],
+            "extractor_versions": result["extractor_versions"],
         }
         sys.stdout.write(json.dumps(out, separators=(",", ":")))
         sys.stdout.write("\n")
@@ -1,21 +1,44 @@
 #!/usr/bin/env python3
+import os
+import tracemalloc
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse
 
+from src.audit.store import AuditStore
 from src.engine import CDEEngine
+from src.profiling.memory import session_memory_report
+from src.profiling.sampler import RequestProfiler
 from src.types.turn_packet import TurnPacket
 
 REPO_ROOT = str(Path(__file__).resolve().parent)
-app = FastAPI(title="CDE Service", version="1.0.0")
 engines: Dict[str, CDEEngine] = {}
+# optional: full events for every session go to an indexed audit store
+audit_store: Optional[AuditStore] = AuditStore(os.environ["CDE_AUDIT_STORE"]) if os.environ.get("CDE_AUDIT_STORE") else None
+# opt-in request profiling, toggled via /admin/profiling; a no-op check when disabled
+profiler = RequestProfiler(os.environ.get("CDE_PROFILE_DIR") or str(Path(REPO_ROOT) / "logs" / "profiles"))
+# admin routes (/admin/*) exist only when a token is configured
+ADMIN_TOKEN = os.environ.get("CDE_ADMIN_TOKEN")
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    yield
+    # seal the active segment so its sidecar index is on disk
+    if audit_store is not None:
+        audit_store.close()
+
+
+app = FastAPI(title="CDE Service", version="1.0.0", lifespan=_lifespan)
 
 
 def _engine_for(session_id: str) -> CDEEngine:
     engine = engines.get(session_id)
     if engine is None:
-        engine = CDEEngine(repo_root=REPO_ROOT)
+        engine = CDEEngine(repo_root=REPO_ROOT, audit_logger=audit_store)
         engines[session_id] = engine
     return engine
 
@@ -26,46 +49,96 @@ def _model_dump(model: Any) -> Dict[str, Any]:
     return model.dict()
 
 
-def _scope_priority(scope_key: str) -> int:
-    if scope_key.startswith("scene:"):
-        return 4
-    if scope_key.startswith("task:"):
-        return 3
-    if scope_key.startswith("agent:"):
-        return 2
-    if scope_key == "global":
-        return 1
-    return 0
+def _turn(session_id: str, payload: Dict[str, Any]) -> JSONResponse:
+    turn_payload = dict(payload)
+    turn_payload.pop("session_id", None)
+    # "full" (default), "top_event" or "decision"; narrower projections skip building unused events
+    projection = str(turn_payload.pop("projection", None) or "full")
 
+    if hasattr(TurnPacket, "model_validate"):
+        packet = TurnPacket.model_validate(turn_payload)
+    else:
+        packet = TurnPacket.parse_obj(turn_payload)
 
-def _choose_top_event(events: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    if not events:
-        return None
-    return max(events, key=lambda e: (_scope_priority(str(e.get("scope_key", ""))), float(e.get("severity", 0.0))))
+    result = _engine_for(session_id).evaluate_turn(packet, projection=projection)
+    events_json = [_model_dump(e) for e in result["events"]]
+    top_event = result["top_event"]
+    # reuse the already-dumped dict when the top event is also in events
+    top_event_json = next((j for e, j in zip(result["events"], events_json) if e is top_event), None)
+    if top_event is not None and top_event_json is None:
+        top_event_json = _model_dump(top_event)
+
+    # rendered here rather than by FastAPI so profiled samples include serialization
+    return JSONResponse({
+        "events": events_json,
+        "top_event": top_event_json,
+        "decision": result["decision"],
+        "baseline_hash": result["baseline_hash"],
+        "extractor_versions": result["extractor_versions"],
+    })
 
 
 @app.post("/turn")
-def turn(payload: Dict[str, Any]) -> Dict[str, Any]:
+def turn(payload: Dict[str, Any]) -> JSONResponse:
     try:
         session_id = str(payload.get("session_id") or "default")
-        turn_payload = dict(payload)
-        turn_payload.pop("session_id", None)
-
-        if hasattr(TurnPacket, "model_validate"):
-            packet = TurnPacket.model_validate(turn_payload)
-        else:
-            packet = TurnPacket.parse_obj(turn_payload)
-
-        events = _engine_for(session_id).process_turn(packet)
-        events_json = [_model_dump(e) for e in events]
-        top_event = _choose_top_event(events_json)
-
-        return {
-            "events": events_json,
-            "top_event": top_event,
-            "decision": (top_event or {}).get("decision", {}),
-            "baseline_hash": (top_event or {}).get("baseline_hash"),
-            "extractor_versions": (top_event or {}).get("extractor_versions"),
-        }
+        # the whole handler is profiled (validation, evaluation, dumps), not just the engine call
+        return profiler.call(session_id, str(payload.get("turn_id") or ""), _turn, session_id, payload)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _check_admin(token: Optional[str]):
+    # fail closed: without CDE_ADMIN_TOKEN the admin surface is not exposed at all
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="invalid admin token")
+
+
+@app.get("/admin/profiling")
+def profiling_status(x_admin_token: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    _check_admin(x_admin_token)
+    return profiler.status()
+
+
+@app.post("/admin/profiling")
+def profiling_configure(payload: Dict[str, Any], x_admin_token: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    """Body: {"enabled": bool, "sample_rate": 0..1, "cprofile": bool, "reset": bool,
+    "max_bytes": int, "max_files": int} (all optional; flags must be JSON booleans)."""
+    _check_admin(x_admin_token)
+    try:
+        return profiler.configure(
+            enabled=payload.get("enabled"),
+            sample_rate=payload.get("sample_rate"),
+            cprofile=payload.get("cprofile"),
+            reset=payload.get("reset"),
+            max_bytes=payload.get("max_bytes"),
+            max_files=payload.get("max_files"),
+        )
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.get("/admin/memory")
+def memory_report(top: int = 20, x_admin_token: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    _check_admin(x_admin_token)
+    if top < 1:
+        raise HTTPException(status_code=400, detail="top must be >= 1")
+    return session_memory_report(engines, top_n=top)
+
+
+@app.post("/admin/memory")
+def memory_configure(payload: Dict[str, Any], x_admin_token: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    """Body: {"tracing": bool, "frames": int}. Tracing costs memory/CPU on every allocation while on."""
+    _check_admin(x_admin_token)
+    tracing = payload.get("tracing")
+    frames = payload.get("frames", 1)
+    # tracemalloc.start accepts 1..65535 frames; bool is an int subclass, reject it too
+    if isinstance(frames, bool) or not isinstance(frames, int) or not 1 <= frames <= 65535:
+        raise HTTPException(status_code=400, detail="frames must be an integer in 1..65535")
+    if tracing and not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    elif tracing is False and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return {"tracing": tracemalloc.is_tracing()}
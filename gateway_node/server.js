@@ -13,6 +13,8 @@ const cdeServiceUrl = process.env.CDE_SERVICE_URL || "http://127.0.0.1:8008/turn
 const venvPythonPath = path.resolve(repoRoot, ".venv", "bin", "python3");
 const pythonCmd = fs.existsSync(venvPythonPath) ? venvPythonPath : "python3";
 const decisionLogPath = path.resolve(repoRoot, "logs", "gateway_decisions.jsonl");
+// /tool only needs the top event; set CDE_TOOL_PROJECTION=full to get every scope's event
+const toolProjection = process.env.CDE_TOOL_PROJECTION || "top_event";
 
 const reversibleTools = new Set(["fs.write", "git.commit"]);
 const destructiveTools = new Set(["fs.delete", "shell.rm", "git.reset_hard"]);
@@ -160,6 +162,7 @@ app.post("/tool", async (req, res) => {
     task_id: task_id ?? null,
     scene_id: scene_id ?? null,
     session_id: session_id ?? "default",
+    projection: toolProjection,
   };
 
   let turn;
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from bench import load, micro
+from bench.synth import TurnGenerator
+from src.engine import CDEEngine
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# metric name -> True when larger is better; spread comes from <metric>_min/_max
+# (ns_per_op_median uses ns_per_op_min/_max) when the results carry it
+COMPARE_METRICS = {
+    "ns_per_op_median": False,
+    "alloc_bytes_per_op": False,
+    "throughput_rps": True,
+    "latency_ms_p50": False,
+    "latency_ms_p95": False,
+    "latency_ms_p99": False,
+}
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:  # noqa: BLE001 - benchmarks still run outside a checkout
+        return "unknown"
+
+
+def _generator(args: argparse.Namespace) -> TurnGenerator:
+    return TurnGenerator(
+        seed=args.seed,
+        text_len=args.text_len,
+        signal_density=args.signal_density,
+        sessions=args.sessions,
+        scope_fanout=args.scope_fanout,
+    )
+
+
+def _repeat_load(cases: Dict[str, Any], repeats: int) -> Dict[str, Any]:
+    """Run each load test `repeats` times, interleaved across cases so the spread reflects
+    drift over the whole run; report each metric's median plus its min/max."""
+    runs: Dict[str, List[Dict[str, Any]]] = {name: [] for name in cases}
+    for _ in range(max(1, repeats)):
+        for name, fn in cases.items():
+            runs[name].append(fn())
+    out: Dict[str, Any] = {}
+    for name, case_runs in runs.items():
+        agg: Dict[str, Any] = dict(case_runs[0])
+        for key in case_runs[0]:
+            if key in COMPARE_METRICS:
+                vals = sorted(float(r[key]) for r in case_runs)
+                agg[key] = micro._percentile(vals, 0.5)
+                agg[f"{key}_min"] = vals[0]
+                agg[f"{key}_max"] = vals[-1]
+        agg["repeats"] = len(case_runs)
+        out[name] = agg
+    return out
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    config = {k: v for k, v in vars(args).items() if k not in ("cmd", "out")}
+    results: Dict[str, Any] = {
+        "meta": {
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started_at": time.time(),
+            "config": config,
+        },
+    }
+    if not args.skip_micro:
+        results["micro"] = micro.run(REPO_ROOT, _generator(args), ops=args.ops, repeats=args.repeats)
+    load_cases: Dict[str, Any] = {}
+    projections = list(args.projections)
+    if not hasattr(CDEEngine, "evaluate_turn"):
+        # this tree's /turn ignores "projection": those cases would just re-run full
+        projections = [p for p in projections if p == "full"]
+    if not args.skip_load:
+        for projection in projections:
+            # fresh seeded generator per call so every repeat replays the same turns
+            load_cases[f"in_process.{projection}"] = lambda p=projection: load.run_in_process(
+                _generator(args), requests=args.requests, concurrency=args.concurrency, projection=p)
+        if not args.skip_http:
+            for projection in projections:
+                load_cases[f"http.{projection}"] = lambda p=projection: load.run_http(
+                    _generator(args), requests=args.requests, concurrency=args.concurrency, projection=p)
+    if load_cases:
+        results["load"] = _repeat_load(load_cases, args.load_repeats)
+    return results
+
+
+def _spread_keys(metric: str) -> Tuple[str, str]:
+    if metric == "ns_per_op_median":
+        return "ns_per_op_min", "ns_per_op_max"
+    return f"{metric}_min", f"{metric}_max"
+
+
+def _flatten(results: Dict[str, Any]) -> Dict[Tuple[str, str], Tuple[float, float, float]]:
+    """(case, metric) -> (value, spread_lo, spread_hi); the spread collapses to the value when absent."""
+    out: Dict[Tuple[str, str], Tuple[float, float, float]] = {}
+    for section in ("micro", "load"):
+        for case, metrics in (results.get(section) or {}).items():
+            for metric in COMPARE_METRICS:
+                if metric in metrics:
+                    value = float(metrics[metric])
+                    lo_key, hi_key = _spread_keys(metric)
+                    lo = float(metrics.get(lo_key, value))
+                    hi = float(metrics.get(hi_key, value))
+                    out[(f"{section}.{case}", metric)] = (value, min(lo, value), max(hi, value))
+    return out
+
+
+def compare(old_path: str, new_path: str, threshold: float) -> int:
+    with open(old_path, "r", encoding="utf-8") as f:
+        old_results = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new_results = json.load(f)
+    for label, res in (("old", old_results), ("new", new_results)):
+        repeats = min((int(m.get("repeats", 1)) for sec in ("micro", "load") for m in (res.get(sec) or {}).values()), default=1)
+        if repeats < 3:
+            print(f"warning: {label} run has only {repeats} repeat(s) per case; its spread will not cover run-to-run noise\n")
+    old, new = _flatten(old_results), _flatten(new_results)
+
+    for label, only in (("old", set(old) - set(new)), ("new", set(new) - set(old))):
+        cases = sorted({case for case, _ in only})
+        if cases:
+            print(f"not compared (only in the {label} run): {', '.join(cases)}\n")
+
+    regressions: List[str] = []
+    for key in sorted(set(old) & set(new)):
+        case, metric = key
+        (a, lo, hi), (b, new_lo, new_hi) = old[key], new[key]
+        change = (b - a) / a if a else 0.0
+        larger_is_better = COMPARE_METRICS[metric]
+        worse = -change if larger_is_better else change
+        # only a move past the threshold whose whole spread clears the old run's spread counts
+        outside = new_hi < lo if larger_is_better else new_lo > hi
+        flag = "REGRESSION" if worse > threshold and outside else ""
+        print(f"{case:40s} {metric:20s} {a:14.1f} -> {b:14.1f} {change:+7.1%} {flag}")
+        if flag:
+            regressions.append(f"{case}.{metric}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {threshold:.0%} and outside the baseline spread")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CDE pipeline benchmarks and load tests")
+    sub = parser.add_subparsers(dest="cmd")
+
+    p_run = sub.add_parser("run", help="run benchmarks and write JSON results (default)")
+    p_run.add_argument("--out", default=None, help="results path (default: logs/bench/<commit>-<time>.json)")
+    p_run.add_argument("--seed", type=int, default=1234)
+    p_run.add_argument("--text-len", type=int, default=160)
+    p_run.add_argument("--signal-density", type=float, default=0.15)
+    p_run.add_argument("--sessions", type=int, default=8)
+    p_run.add_argument("--scope-fanout", type=int, default=3)
+    p_run.add_argument("--ops", type=int, default=500, help="ops per microbenchmark repeat")
+    p_run.add_argument("--repeats", type=int, default=5)
+    p_run.add_argument("--requests", type=int, default=1000, help="requests per load test")
+    p_run.add_argument("--concurrency", type=int, default=4)
+    p_run.add_argument("--load-repeats", type=int, default=3, help="runs per load test (median + min/max spread)")
+    p_run.add_argument("--projections", nargs="+", default=["full", "top_event"], choices=["full", "top_event", "decision"])
+    p_run.add_argument("--skip-micro", action="store_true")
+    p_run.add_argument("--skip-load", action="store_true")
+    p_run.add_argument("--skip-http", action="store_true")
+
+    p_cmp = sub.add_parser("compare", help="compare two results files; exit 1 on regressions")
+    p_cmp.add_argument("old")
+    p_cmp.add_argument("new")
+    p_cmp.add_argument("--threshold", type=float, default=0.10, help="relative slowdown that counts as a regression")
+
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in ("run", "compare", "-h", "--help"):
+        argv = ["run"] + argv
+    args = parser.parse_args(argv)
+
+    if args.cmd == "compare":
+        return compare(args.old, args.new, args.threshold)
+
+    results = run(args)
+    out = args.out or os.path.join(REPO_ROOT, "logs", "bench", f"{results['meta']['git_commit']}-{int(time.time())}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for section in ("micro", "load"):
+        for case, m in (results.get(section) or {}).items():
+            if "ns_per_op_median" in m:
+                print(f"{case:32s} {m['ns_per_op_median'] / 1000.0:10.2f} us/op")
+            else:
+                print(f"{case:32s} {m['throughput_rps']:8.1f} rps  p50={m['latency_ms_p50']:.2f}ms p95={m['latency_ms_p95']:.2f}ms p99={m['latency_ms_p99']:.2f}ms")
+    print(f"Wrote: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
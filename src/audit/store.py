@@ -0,0 +1,518 @@
+import fcntl, json, os, sys, mmap, threading
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+SEGMENT_PREFIX = "seg-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx.json"
+SUMMARY_SUFFIX = ".sum.json"
+COLUMNS_SCHEMA = "columns.json"
+INDEX_VERSION = "audit_index_v0.1"
+LOCK_FILE = ".lock"
+
+# fixed numeric columns exported for analytics: name -> array typecode
+NUMERIC_COLUMNS = {
+    "ts": "d",
+    "severity": "d",
+    "ema_severity": "d",
+    "confidence": "d",
+    "policy_gate_level": "b",  # -1 when the record carries no decision
+    "enter": "B",
+    "exit": "B",
+    "active": "B",
+    "quarantine": "B",
+    "scope_code": "i",  # index into the exported scope dictionary
+}
+_DTYPES = {"d": "<f8", "b": "i1", "B": "u1", "i": "<i4"}
+
+
+def _event_view(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Engine events are indexed as-is; gateway decision records via their top_event."""
+    if "scope_key" in record:
+        return record
+    top = record.get("top_event")
+    return top if isinstance(top, dict) else {}
+
+
+def _record_ts(record: Dict[str, Any]) -> Optional[float]:
+    ts = record.get("ts", _event_view(record).get("ts"))
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    if isinstance(ts, str):
+        # gateway logs use ISO-8601 with a trailing Z
+        try:
+            return datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def _gate_level(record: Dict[str, Any]) -> int:
+    if "policy_gate_level" in record:
+        return int(record["policy_gate_level"])
+    decision = _event_view(record).get("decision") or {}
+    return int(decision.get("policy_gate_level", -1))
+
+
+def _quarantined(record: Dict[str, Any]) -> bool:
+    decision = record.get("decision") or _event_view(record).get("decision") or {}
+    return bool(decision.get("quarantine", False))
+
+
+def _overlaps(ts_range, since: Optional[float], until: Optional[float]) -> bool:
+    lo, hi = ts_range
+    if lo is None:
+        return True  # cannot rule the segment out
+    if since is not None and hi < since:
+        return False
+    if until is not None and lo > until:
+        return False
+    return True
+
+
+class _SegmentIndex:
+    """Sidecar index for one segment: row offsets/timestamps plus scope and turn postings."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.bytes = 0
+        self.offsets: List[int] = []
+        self.ts: List[Optional[float]] = []
+        self.scopes: Dict[str, List[int]] = {}
+        self.turns: Dict[str, List[int]] = {}
+        self.skipped = 0  # complete lines that did not parse; kept in the file, never indexed
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets)
+
+    def add(self, offset: int, size: int, record: Dict[str, Any]):
+        row = len(self.offsets)
+        view = _event_view(record)
+        self.offsets.append(offset)
+        self.ts.append(_record_ts(record))
+        scope_key = view.get("scope_key")
+        if scope_key is not None:
+            self.scopes.setdefault(str(scope_key), []).append(row)
+        turn_id = record.get("turn_id", view.get("turn_id"))
+        if turn_id is not None:
+            self.turns.setdefault(str(turn_id), []).append(row)
+        self.bytes = offset + size
+
+    def ts_range(self):
+        known = [t for t in self.ts if t is not None]
+        return (min(known), max(known)) if known else (None, None)
+
+    def summary(self) -> Dict[str, Any]:
+        ts_min, ts_max = self.ts_range()
+        return {
+            "index_version": INDEX_VERSION,
+            "segment": self.name,
+            "count": self.count,
+            "bytes": self.bytes,
+            "ts_min": ts_min,
+            "ts_max": ts_max,
+            "scopes": sorted(self.scopes),
+            "turn_count": len(self.turns),
+            "skipped": self.skipped,
+        }
+
+    def overlaps(self, since: Optional[float], until: Optional[float]) -> bool:
+        return _overlaps(self.ts_range(), since, until)
+
+    def rows(self, scope_key: Optional[str], turn_id: Optional[str], since: Optional[float], until: Optional[float]) -> List[int]:
+        if scope_key is not None and turn_id is not None:
+            rows = sorted(set(self.scopes.get(scope_key, [])) & set(self.turns.get(turn_id, [])))
+        elif scope_key is not None:
+            rows = self.scopes.get(scope_key, [])
+        elif turn_id is not None:
+            rows = self.turns.get(turn_id, [])
+        else:
+            rows = range(self.count)
+        if since is None and until is None:
+            return list(rows)
+        out = []
+        for r in rows:
+            t = self.ts[r]
+            if t is None:
+                continue
+            if since is not None and t < since:
+                continue
+            if until is not None and t > until:
+                continue
+            out.append(r)
+        return out
+
+    def to_json(self) -> Dict[str, Any]:
+        ts_min, ts_max = self.ts_range()
+        return {
+            "index_version": INDEX_VERSION,
+            "segment": self.name,
+            "count": self.count,
+            "bytes": self.bytes,
+            "ts_min": ts_min,
+            "ts_max": ts_max,
+            "offsets": self.offsets,
+            "ts": self.ts,
+            "scopes": self.scopes,
+            "turns": self.turns,
+            "skipped": self.skipped,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "_SegmentIndex":
+        idx = cls(data["segment"])
+        idx.bytes = int(data["bytes"])
+        idx.offsets = list(data["offsets"])
+        idx.ts = list(data["ts"])
+        idx.scopes = {k: list(v) for k, v in data["scopes"].items()}
+        idx.turns = {k: list(v) for k, v in data["turns"].items()}
+        idx.skipped = int(data.get("skipped", 0))
+        return idx
+
+
+class _SegmentSummary:
+    """Open-time stand-in for a segment whose postings have not been loaded yet.
+
+    Carries just enough (row count, time range, scope keys) to rule a segment in or
+    out of a query; AuditStore swaps in the full _SegmentIndex when a query needs rows.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.name = data["segment"]
+        self.count = int(data["count"])
+        self.bytes = int(data["bytes"])
+        self.ts_min = data.get("ts_min")
+        self.ts_max = data.get("ts_max")
+        self.scopes = frozenset(data.get("scopes", ()))
+        self.turn_count = int(data.get("turn_count", 0))
+        self.skipped = int(data.get("skipped", 0))
+
+    def ts_range(self):
+        return self.ts_min, self.ts_max
+
+    def overlaps(self, since: Optional[float], until: Optional[float]) -> bool:
+        return _overlaps(self.ts_range(), since, until)
+
+
+class AuditStore:
+    """Segmented JSONL audit store with per-segment sidecar indexes.
+
+    Drop-in for AuditLogger (same append signature). Records roll over into a new
+    segment every `segment_max_records`; each segment gets a `.idx.json` sidecar keyed
+    by scope_key, turn_id and timestamp so queries only open the segments they need.
+    Opening reads only each segment's small `.sum.json` summary; a segment's postings
+    are loaded the first time a query cannot rule it out from the summary alone.
+    Open with read_only=True to query a store another process is appending to.
+    """
+
+    def __init__(self, root: str, segment_max_records: int = 5000, index_every: int = 100, read_only: bool = False):
+        self.root = root
+        self.segment_max_records = int(segment_max_records)
+        # the active segment's sidecar is rewritten every `index_every` appends so readers
+        # of a live store only scan the few records written since
+        self.index_every = max(1, int(index_every))
+        # readers never truncate segments or write sidecars; they index unsaved tails in memory
+        self.read_only = bool(read_only)
+        self._lock_fh = None
+        if not read_only:
+            os.makedirs(root, exist_ok=True)
+            # before loading: a writer may truncate torn tails, which must never race another writer
+            self._acquire_writer_lock()
+        self._indexes: List[Any] = [self._open_entry(n) for n in self._segment_names()]
+        self._fh = None
+        self._lock = threading.Lock()  # the warm service appends from worker threads
+
+    # ---- single-writer lock ----
+
+    def _acquire_writer_lock(self):
+        fh = open(os.path.join(self.root, LOCK_FILE), "a+b")
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            raise RuntimeError(
+                f"audit store {self.root!r} is already open for writing by another process; "
+                "open it with read_only=True to query, or write to a different store"
+            ) from None
+        self._lock_fh = fh
+
+    def _release_writer_lock(self):
+        if self._lock_fh is not None:
+            fcntl.flock(self._lock_fh.fileno(), fcntl.LOCK_UN)
+            self._lock_fh.close()
+            self._lock_fh = None
+
+    # ---- layout ----
+
+    def _segment_names(self) -> List[str]:
+        return sorted(
+            f[: -len(SEGMENT_SUFFIX)]
+            for f in os.listdir(self.root)
+            if f.startswith(SEGMENT_PREFIX) and f.endswith(SEGMENT_SUFFIX)
+        )
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.root, name + SEGMENT_SUFFIX)
+
+    def _index_path(self, name: str) -> str:
+        return os.path.join(self.root, name + INDEX_SUFFIX)
+
+    def _summary_path(self, name: str) -> str:
+        return os.path.join(self.root, name + SUMMARY_SUFFIX)
+
+    def _open_entry(self, name: str):
+        """The segment's summary when it covers the whole file, else its full index."""
+        path = self._summary_path(name)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("index_version") == INDEX_VERSION and int(data.get("bytes", -1)) == os.path.getsize(self._segment_path(name)):
+                return _SegmentSummary(data)
+        idx = self._load_index(name)
+        if not self.read_only:
+            # stores written before summaries existed get one on their next writer open
+            self._write_summary(idx)
+        return idx
+
+    def _postings(self, i: int) -> _SegmentIndex:
+        entry = self._indexes[i]
+        if isinstance(entry, _SegmentSummary):
+            entry = self._indexes[i] = self._load_index(entry.name)
+        return entry
+
+    def _load_index(self, name: str) -> _SegmentIndex:
+        path = self._index_path(name)
+        size = os.path.getsize(self._segment_path(name))
+        idx = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("index_version") == INDEX_VERSION and int(data.get("bytes", -1)) <= size:
+                idx = _SegmentIndex.from_json(data)
+        if idx is None:
+            idx = _SegmentIndex(name)
+        if idx.bytes == size:
+            return idx
+        # sidecar missing or behind the segment (live writer, or crash before close):
+        # index only the tail past what the sidecar already covers
+        self._index_tail(idx)
+        if not self.read_only:
+            if idx.bytes < size:
+                # only an unterminated final line is left past idx.bytes: drop that torn record so new appends start on a clean line
+                with open(self._segment_path(name), "r+b") as f:
+                    f.truncate(idx.bytes)
+            self._write_index(idx)
+        return idx
+
+    def _index_tail(self, idx: _SegmentIndex):
+        """Index complete records after idx.bytes, stopping at an unterminated final line.
+
+        A complete line that does not parse is skipped (and counted), not treated as the
+        end of the segment, so the valid records after it stay indexed.
+        """
+        with open(self._segment_path(idx.name), "rb") as f:
+            f.seek(idx.bytes)
+            offset = idx.bytes
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = None
+                    if isinstance(record, dict):
+                        idx.add(offset, len(line), record)
+                    else:
+                        idx.skipped += 1
+                offset += len(line)
+                idx.bytes = offset
+
+    def _write_index(self, idx: _SegmentIndex):
+        tmp = self._index_path(idx.name) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(idx.to_json(), f, separators=(",", ":"))
+        os.replace(tmp, self._index_path(idx.name))
+        # summary second: it must never claim bytes the sidecar does not cover
+        self._write_summary(idx)
+
+    def _write_summary(self, idx: _SegmentIndex):
+        tmp = self._summary_path(idx.name) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(idx.summary(), f, separators=(",", ":"))
+        os.replace(tmp, self._summary_path(idx.name))
+
+    # ---- writing ----
+
+    def _open_segment(self) -> _SegmentIndex:
+        if self.read_only:
+            raise RuntimeError("audit store opened read-only")
+        if self._lock_fh is None:
+            # reopened after close(): the store may have changed while unlocked
+            self._acquire_writer_lock()
+            self._indexes = [self._open_entry(n) for n in self._segment_names()]
+        if self._indexes and self._indexes[-1].count < self.segment_max_records:
+            idx = self._postings(-1)
+        else:
+            idx = _SegmentIndex(f"{SEGMENT_PREFIX}{len(self._indexes) + 1:06d}")
+            self._indexes.append(idx)
+        self._fh = open(self._segment_path(idx.name), "ab")
+        return idx
+
+    def append(self, record: Dict[str, Any]):
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            idx = self._indexes[-1] if self._fh is not None else self._open_segment()
+            self._fh.write(line)
+            self._fh.flush()
+            idx.add(idx.bytes, len(line), record)
+            if idx.count >= self.segment_max_records:
+                self._seal()
+            elif idx.count % self.index_every == 0:
+                self._write_index(idx)
+
+    def _seal(self):
+        if self._fh is None:
+            return
+        self._fh.close()
+        self._fh = None
+        self._write_index(self._indexes[-1])
+
+    def close(self):
+        with self._lock:
+            self._seal()
+            self._release_writer_lock()
+
+    def flush_index(self):
+        """Persist the active segment's sidecar without sealing it."""
+        with self._lock:
+            if self._fh is not None:
+                self._write_index(self._indexes[-1])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- querying ----
+
+    def segments(self) -> List[Dict[str, Any]]:
+        out = []
+        for idx in self._indexes:  # summaries are enough; never loads postings
+            ts_min, ts_max = idx.ts_range()
+            out.append({"segment": idx.name, "count": idx.count, "ts_min": ts_min, "ts_max": ts_max, "scopes": sorted(idx.scopes), "skipped": idx.skipped})
+        return out
+
+    def query(
+        self,
+        scope_key: Optional[str] = None,
+        turn_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        quarantine: Optional[bool] = None,
+        transitions_only: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield records matching all given filters, in append order.
+
+        Segments whose index has no posting for scope_key/turn_id or whose time range
+        falls outside [since, until] are never opened.
+        """
+        if self._fh is not None:
+            self._fh.flush()
+        for i, entry in enumerate(self._indexes):
+            if scope_key is not None and scope_key not in entry.scopes:
+                continue
+            if not entry.overlaps(since, until):
+                continue
+            idx = self._postings(i)
+            if turn_id is not None and turn_id not in idx.turns:
+                continue
+            rows = idx.rows(scope_key, turn_id, since, until)
+            if not rows:
+                continue
+            with open(self._segment_path(idx.name), "rb") as f:
+                for r in rows:
+                    f.seek(idx.offsets[r])
+                    record = json.loads(f.readline())
+                    if quarantine is not None and _quarantined(record) != quarantine:
+                        continue
+                    if transitions_only:
+                        view = _event_view(record)
+                        if not (view.get("enter") or view.get("exit")):
+                            continue
+                    yield record
+
+    # ---- columnar export ----
+
+    def export_columns(self, out_dir: str, **filters) -> Dict[str, Any]:
+        """Write numeric fields of matching records as raw little-endian column files.
+
+        Each column is `<name>.bin` with a fixed dtype listed in `columns.json`, so it can
+        be opened with numpy.memmap or `load_columns` below. deviation_vector layers become
+        `deviation_vector.<layer>` float64 columns (NaN where the layer was absent).
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        cols = {name: array(code) for name, code in NUMERIC_COLUMNS.items()}
+        dev_cols: Dict[str, array] = {}
+        scope_codes: Dict[str, int] = {}
+        nan = float("nan")
+
+        n = 0
+        for record in self.query(**filters):
+            view = _event_view(record)
+            ts = _record_ts(record)
+            cols["ts"].append(nan if ts is None else ts)
+            cols["severity"].append(float(view.get("severity", nan)))
+            cols["ema_severity"].append(float(view.get("ema_severity", nan)))
+            cols["confidence"].append(float(view.get("confidence", nan)))
+            cols["policy_gate_level"].append(_gate_level(record))
+            cols["enter"].append(int(bool(view.get("enter"))))
+            cols["exit"].append(int(bool(view.get("exit"))))
+            cols["active"].append(int(bool(view.get("active"))))
+            cols["quarantine"].append(int(_quarantined(record)))
+            scope_key = str(view.get("scope_key", ""))
+            cols["scope_code"].append(scope_codes.setdefault(scope_key, len(scope_codes)))
+
+            dvec = view.get("deviation_vector") or {}
+            for layer in dvec:
+                if layer not in dev_cols:
+                    dev_cols[layer] = array("d", [nan] * n)
+            for layer, col in dev_cols.items():
+                col.append(float(dvec.get(layer, nan)))
+            n += 1
+
+        for layer, col in dev_cols.items():
+            cols[f"deviation_vector.{layer}"] = col
+
+        schema = {"rows": n, "byteorder": "little", "scopes": list(scope_codes), "columns": {}}
+        for name, col in cols.items():
+            if sys.byteorder != "little":
+                col.byteswap()
+            with open(os.path.join(out_dir, name + ".bin"), "wb") as f:
+                col.tofile(f)
+            schema["columns"][name] = {"file": name + ".bin", "dtype": _DTYPES[col.typecode], "typecode": col.typecode}
+        with open(os.path.join(out_dir, COLUMNS_SCHEMA), "w", encoding="utf-8") as f:
+            json.dump(schema, f, indent=2)
+        return schema
+
+
+def load_columns(out_dir: str) -> Dict[str, Any]:
+    """Memory-map an export_columns directory. Returns {"schema": ..., "columns": {name: memoryview}}.
+
+    Views are zero-copy over the mapped files (little-endian hosts only).
+    """
+    with open(os.path.join(out_dir, COLUMNS_SCHEMA), "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    columns: Dict[str, memoryview] = {}
+    for name, spec in schema["columns"].items():
+        path = os.path.join(out_dir, spec["file"])
+        if os.path.getsize(path) == 0:
+            columns[name] = memoryview(array(spec["typecode"]))
+            continue
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        columns[name] = memoryview(mm).cast(spec["typecode"])
+    return {"schema": schema, "columns": columns}
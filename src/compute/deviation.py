@@ -1,8 +1,9 @@
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Union
 from ..types.baseline_manifest import BaselineManifest
 from ..types.layer_output import LayerOutput
+from ..types.records import LayerRecord
 
-def compute_deviation_vector(manifest: BaselineManifest, layers: List[LayerOutput]) -> Tuple[Dict[str, float], Dict[str, float]]:
+def compute_deviation_vector(manifest: BaselineManifest, layers: List[Union[LayerOutput, LayerRecord]]) -> Tuple[Dict[str, float], Dict[str, float]]:
     """Return (deviation per layer, confidence per layer). Uses z-like distance from baseline mu."""
     d: Dict[str, float] = {}
     c: Dict[str, float] = {}
@@ -3,17 +3,41 @@ from typing import List, Dict, Any, Optional
 
 from .types.turn_packet import TurnPacket
 from .types.deviation_event import DeviationEvent
-from .extractors.lexical import extract as extract_lexical, EXTRACTOR_VERSION as LEX_VER
-from .extractors.pragmatic import extract as extract_pragmatic, EXTRACTOR_VERSION as PRAG_VER
+from .types.evidence import EvidenceSpan
+from .extractors.lexical import extract_record as extract_lexical, EXTRACTOR_VERSION as LEX_VER
+from .extractors.pragmatic import extract_record as extract_pragmatic, EXTRACTOR_VERSION as PRAG_VER
 from .baseline.retrieve import retrieve_manifest
 from .compute.deviation import compute_deviation_vector, aggregate_severity, aggregate_confidence
 from .event.ema_hysteresis import EMAHysteresis
 from .rationale.build import collect_evidence, dominant_layers
 from .routing.route import route
+from .arbitrate.scopes import scope_priority
+
+PROJECTIONS = ("full", "top_event", "decision")
+
+class _ScopeResult:
+    """Per-scope numbers computed every turn; events are built from these only on demand."""
+    __slots__ = ("scope_key", "manifest", "baseline_hash", "dvec", "severity", "confidence",
+                 "ema", "active", "enter", "exit", "decision")
+
+    def __init__(self, scope_key, manifest, baseline_hash, dvec, severity, confidence, ema, active, enter, exit, decision):
+        self.scope_key = scope_key
+        self.manifest = manifest
+        self.baseline_hash = baseline_hash
+        self.dvec = dvec
+        self.severity = severity
+        self.confidence = confidence
+        self.ema = ema
+        self.active = active
+        self.enter = enter
+        self.exit = exit
+        self.decision = decision
 
 class CDEEngine:
-    def __init__(self, repo_root: str):
+    def __init__(self, repo_root: str, audit_logger: Optional[Any] = None):
         self.repo_root = repo_root
+        # optional sink with append(dict) (AuditLogger / AuditStore); always receives full events
+        self.audit_logger = audit_logger
         # for MVP: single EMA/hysteresis machine per scope key, parameterized per-scope from manifest each step
         self._machines: Dict[str, EMAHysteresis] = {}
 
@@ -30,13 +54,27 @@ class CDEEngine:
         return m
 
     def process_turn(self, packet: TurnPacket, scope_keys: Optional[List[str]] = None) -> List[DeviationEvent]:
+        return self.evaluate_turn(packet, scope_keys=scope_keys, projection="full")["events"]
+
+    def evaluate_turn(self, packet: TurnPacket, scope_keys: Optional[List[str]] = None, projection: str = "full") -> Dict[str, Any]:
+        """Step every scope and materialize only what `projection` asks for.
+
+        projection:
+          full      -- events for every scope (same as process_turn)
+          top_event -- only the top event (most specific scope, then highest severity)
+          decision  -- no events; decision + provenance of the top scope only
+        EMA/hysteresis state advances identically for all projections. With an
+        audit_logger configured, full events are still built and logged.
+        """
+        if projection not in PROJECTIONS:
+            raise ValueError(f"projection must be one of {PROJECTIONS}, got {projection!r}")
         scope_keys = scope_keys or self.default_scopes(packet)
 
-        # extract layers once per turn (constraint-accessible)
+        # extract layers once per turn (constraint-accessible); slotted records until the event boundary
         layers = [extract_lexical(packet), extract_pragmatic(packet)]
         extractor_versions = {"lexical": LEX_VER, "pragmatic": PRAG_VER}
 
-        events: List[DeviationEvent] = []
+        scored: List[_ScopeResult] = []
         for scope_key in scope_keys:
             manifest, baseline_hash = retrieve_manifest(self.repo_root, scope_key)
 
@@ -50,36 +88,72 @@ class CDEEngine:
             st = machine.step(scope_key, severity)
 
             decision = route(severity=severity, confidence=confidence, active=st.active, manifest_routing=manifest.routing or {})
-            evidence = collect_evidence(layers)
+            # snapshot state now: a repeated scope key would mutate the same ScopeState
+            scored.append(_ScopeResult(
+                scope_key, manifest, baseline_hash, dvec, severity, confidence,
+                float(st.ema), bool(st.active), bool(getattr(st, "enter", False)), bool(getattr(st, "exit", False)), decision,
+            ))
+
+        top = max(scored, key=lambda r: (scope_priority(r.scope_key), r.severity)) if scored else None
+        evidence: Optional[List[EvidenceSpan]] = None
 
-            evt = DeviationEvent(
+        def build(r: "_ScopeResult") -> DeviationEvent:
+            nonlocal evidence
+            if evidence is None:
+                # evidence is scope-independent: convert to pydantic once per turn
+                evidence = collect_evidence(layers)
+            return DeviationEvent(
                 event_id=str(uuid.uuid4()),
                 ts=packet.ts,
-                scope_key=scope_key,
-                enter=bool(getattr(st, "enter", False)),
-                exit=bool(getattr(st, "exit", False)),
-                active=bool(st.active),
-                severity=float(severity),
-                ema_severity=float(st.ema),
-                confidence=float(confidence),
-                deviation_vector={k: float(v) for k,v in dvec.items()},
-                dominant_layers=dominant_layers(dvec),
-                manifest_version=manifest.manifest_version,
-                baseline_family_id=manifest.baseline_family_id,
-                parameter_version=manifest.parameter_version,
-                baseline_hash=baseline_hash,
+                scope_key=r.scope_key,
+                enter=r.enter,
+                exit=r.exit,
+                active=r.active,
+                severity=float(r.severity),
+                ema_severity=r.ema,
+                confidence=float(r.confidence),
+                deviation_vector={k: float(v) for k,v in r.dvec.items()},
+                dominant_layers=dominant_layers(r.dvec),
+                manifest_version=r.manifest.manifest_version,
+                baseline_family_id=r.manifest.baseline_family_id,
+                parameter_version=r.manifest.parameter_version,
+                baseline_hash=r.baseline_hash,
                 extractor_versions=extractor_versions,
                 evidence=evidence,
-                decision=decision,
+                decision=r.decision,
                 turn_id=packet.turn_id,
                 speaker_id=packet.speaker_id,
                 channel_id=packet.channel_id,
                 task_id=packet.task_id,
                 scene_id=packet.scene_id,
             )
-            events.append(evt)
 
-        return events
+        top_event: Optional[DeviationEvent] = None
+        events: List[DeviationEvent] = []
+        if projection == "full" or self.audit_logger is not None:
+            all_events = [build(r) for r in scored]
+            if self.audit_logger is not None:
+                for e in all_events:
+                    self.audit_logger.append(e.model_dump())
+            if top is not None:
+                top_event = all_events[scored.index(top)]
+            if projection == "full":
+                events = all_events
+        elif projection == "top_event" and top is not None:
+            top_event = build(top)
+        if projection == "top_event" and top_event is not None:
+            events = [top_event]
+        if projection == "decision":
+            top_event = None
+
+        return {
+            "projection": projection,
+            "events": events,
+            "top_event": top_event,
+            "decision": dict(top.decision) if top is not None else {},
+            "baseline_hash": top.baseline_hash if top is not None else None,
+            "extractor_versions": extractor_versions if top is not None else None,
+        }
 
     def default_scopes(self, packet: TurnPacket) -> List[str]:
         scopes = ["global", f"agent:{packet.speaker_id}"]
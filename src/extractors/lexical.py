@@ -1,17 +1,27 @@
-import re
+import re, sys
 from typing import List
 from ..types.turn_packet import TurnPacket
 from ..types.layer_output import LayerOutput
-from ..types.evidence import EvidenceSpan
+from ..types.records import LayerRecord, SpanRecord
 
-EXTRACTOR_VERSION = "lexical_v0.1"
-ATTRIBUTION_METHOD_ID = "deterministic_regex"
+EXTRACTOR_VERSION = sys.intern("lexical_v0.1")
+ATTRIBUTION_METHOD_ID = sys.intern("deterministic_regex")
+LAYER_ID = sys.intern("lexical")
+
+# interned span id prefixes and notes shared by every span of a kind
+_CAPS_KIND = sys.intern("lex:caps")
+_CAPS_NOTES = sys.intern("ALLCAPS token")
+_REPEAT_KIND = sys.intern("lex:repeat")
+_REPEAT_NOTES = sys.intern("Repeated punctuation")
 
 def _spans(pattern: str, text: str):
     for m in re.finditer(pattern, text):
         yield m.start(), m.end()
 
 def extract(packet: TurnPacket) -> LayerOutput:
+    return extract_record(packet).to_model()
+
+def extract_record(packet: TurnPacket) -> LayerRecord:
     text = packet.text or ""
     n = max(len(text), 1)
 
@@ -29,34 +39,22 @@ def extract(packet: TurnPacket) -> LayerOutput:
     signal = exclam + question + len(caps_words) + repeats
     confidence = max(0.15, min(1.0, 0.25 + 0.02 * min(n, 120) + 0.12 * min(signal, 6)))
 
-    evidence: List[EvidenceSpan] = []
+    turn_id = packet.turn_id
+    evidence: List[SpanRecord] = []
     # evidence spans: caps words, repeated punctuation runs
     for w in caps_words[:8]:
         idx = text.find(w)
         if idx >= 0:
-            evidence.append(EvidenceSpan(
-                span_id=f"{packet.turn_id}:lex:caps:{idx}",
-                turn_id=packet.turn_id,
-                layer_id="lexical",
-                start=idx,
-                end=idx+len(w),
-                score=min(1.0, 0.6 + 0.05*len(w)),
-                confidence=confidence,
-                attribution_method_id=ATTRIBUTION_METHOD_ID,
-                extractor_version=EXTRACTOR_VERSION,
-                notes="ALLCAPS token"
+            evidence.append(SpanRecord(
+                turn_id, LAYER_ID, _CAPS_KIND, idx, idx+len(w),
+                min(1.0, 0.6 + 0.05*len(w)), confidence,
+                ATTRIBUTION_METHOD_ID, EXTRACTOR_VERSION, _CAPS_NOTES,
             ))
     for s,e in _spans(r"([!?\.])\1{2,}", text):
-        evidence.append(EvidenceSpan(
-            span_id=f"{packet.turn_id}:lex:repeat:{s}",
-            turn_id=packet.turn_id,
-            layer_id="lexical",
-            start=s, end=e,
-            score=min(1.0, 0.7),
-            confidence=confidence,
-            attribution_method_id=ATTRIBUTION_METHOD_ID,
-            extractor_version=EXTRACTOR_VERSION,
-            notes="Repeated punctuation"
+        evidence.append(SpanRecord(
+            turn_id, LAYER_ID, _REPEAT_KIND, s, e,
+            min(1.0, 0.7), confidence,
+            ATTRIBUTION_METHOD_ID, EXTRACTOR_VERSION, _REPEAT_NOTES,
         ))
 
-    return LayerOutput(layer_id="lexical", score=score, confidence=confidence, evidence=evidence)
+    return LayerRecord(LAYER_ID, score, confidence, evidence)
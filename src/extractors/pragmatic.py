@@ -1,11 +1,13 @@
-import re
+import re, sys
 from typing import List
 from ..types.turn_packet import TurnPacket
 from ..types.layer_output import LayerOutput
-from ..types.evidence import EvidenceSpan
+from ..types.records import LayerRecord, SpanRecord
 
-EXTRACTOR_VERSION = "pragmatic_v0.1"
-ATTRIBUTION_METHOD_ID = "deterministic_phrase_rules"
+EXTRACTOR_VERSION = sys.intern("pragmatic_v0.1")
+ATTRIBUTION_METHOD_ID = sys.intern("deterministic_phrase_rules")
+LAYER_ID = sys.intern("pragmatic")
+_SPAN_KIND = sys.intern("prag")
 
 # simple demand/command markers and ultimatum markers
 DEMAND_PATTERNS = [
@@ -24,7 +26,14 @@ ULTIMATUM_PATTERNS = [
     r"\blast chance\b",
 ]
 
+# per-pattern (score, notes), built once so spans share the same strings
+_PATTERN_META = {p: (0.55, sys.intern(f"Matched: {p}")) for p in DEMAND_PATTERNS}
+_PATTERN_META.update({p: (0.75, sys.intern(f"Matched: {p}")) for p in ULTIMATUM_PATTERNS if p not in _PATTERN_META})
+
 def extract(packet: TurnPacket) -> LayerOutput:
+    return extract_record(packet).to_model()
+
+def extract_record(packet: TurnPacket) -> LayerRecord:
     text = (packet.text or "").lower()
     n = max(len(text), 1)
 
@@ -43,18 +52,14 @@ def extract(packet: TurnPacket) -> LayerOutput:
     # confidence: higher with explicit phrases
     confidence = max(0.20, min(1.0, 0.35 + 0.10 * min(len(demand_hits), 4) + 0.15 * min(len(ult_hits), 3) + 0.01 * min(n, 100)))
 
-    evidence: List[EvidenceSpan] = []
+    turn_id = packet.turn_id
+    evidence: List[SpanRecord] = []
     for s,e,p in (demand_hits[:10] + ult_hits[:10]):
-        evidence.append(EvidenceSpan(
-            span_id=f"{packet.turn_id}:prag:{s}",
-            turn_id=packet.turn_id,
-            layer_id="pragmatic",
-            start=s, end=e,
-            score=min(1.0, 0.55 if p in DEMAND_PATTERNS else 0.75),
-            confidence=confidence,
-            attribution_method_id=ATTRIBUTION_METHOD_ID,
-            extractor_version=EXTRACTOR_VERSION,
-            notes=f"Matched: {p}"
+        span_score, notes = _PATTERN_META[p]
+        evidence.append(SpanRecord(
+            turn_id, LAYER_ID, _SPAN_KIND, s, e,
+            min(1.0, span_score), confidence,
+            ATTRIBUTION_METHOD_ID, EXTRACTOR_VERSION, notes,
         ))
 
-    return LayerOutput(layer_id="pragmatic", score=score, confidence=confidence, evidence=evidence)
+    return LayerRecord(LAYER_ID, score, confidence, evidence)
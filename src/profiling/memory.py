@@ -0,0 +1,88 @@
+import sys, tracemalloc
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> Tuple[int, int]:
+    """Return (bytes, traced_bytes) for obj and everything it owns.
+
+    traced_bytes counts only objects tracemalloc saw being allocated, i.e. growth
+    since tracing started (0 when tracing is off). Objects in `seen` are skipped,
+    so shared structures are attributed to whoever is walked first.
+    """
+    seen = set() if seen is None else seen
+    tracing = tracemalloc.is_tracing()
+    total = traced = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, type):
+            continue
+        seen.add(id(o))
+        size = sys.getsizeof(o)
+        total += size
+        if tracing and tracemalloc.get_object_traceback(o) is not None:
+            traced += size
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        else:
+            d = getattr(o, "__dict__", None)
+            if d is not None:
+                stack.append(d)
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total, traced
+
+def session_memory_report(engines: Dict[str, Any], top_n: int = 20, top_sites: int = 10) -> Dict[str, Any]:
+    """Per-session memory for the service's `engines` map, largest first.
+
+    Each session reports its engine's own attributes, its `_machines` and their
+    `state` dicts. The shared audit logger is excluded.
+    """
+    tracing = tracemalloc.is_tracing()
+    sessions: List[Dict[str, Any]] = []
+    for session_id, engine in list(engines.items()):
+        seen: Set[int] = {id(getattr(engine, "audit_logger", None))}
+        machines = dict(getattr(engine, "_machines", {}))
+        machine_rows = []
+        state_bytes = traced = scopes = 0
+        for scope_key, m in machines.items():
+            st_bytes, st_traced = deep_sizeof(m.state, seen)
+            m_bytes, m_traced = deep_sizeof(m, seen)
+            state_bytes += st_bytes
+            traced += st_traced + m_traced
+            scopes += len(m.state)
+            machine_rows.append({"scope_key": scope_key, "bytes": m_bytes + st_bytes, "states": len(m.state)})
+        machines_bytes = sum(r["bytes"] for r in machine_rows)
+        # whatever the engine holds besides its machines (dict container, repo_root, ...)
+        rest_bytes, rest_traced = deep_sizeof(engine, seen)
+        machine_rows.sort(key=lambda r: r["bytes"], reverse=True)
+        sessions.append({
+            "session_id": session_id,
+            "bytes": rest_bytes + machines_bytes,
+            "machines": len(machines),
+            "scopes": scopes,
+            "machines_bytes": machines_bytes,
+            "state_bytes": state_bytes,
+            "traced_bytes": traced + rest_traced if tracing else None,
+            "largest_machines": machine_rows[:5],
+        })
+    sessions.sort(key=lambda s: s["bytes"], reverse=True)
+
+    report: Dict[str, Any] = {
+        "sessions_total": len(sessions),
+        "bytes_total": sum(s["bytes"] for s in sessions),
+        "sessions": sessions[:top_n],
+        "tracemalloc": {"tracing": tracing},
+    }
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:top_sites]
+        report["tracemalloc"].update({
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top_sites": [{"site": str(s.traceback), "bytes": s.size, "count": s.count} for s in stats],
+        })
+    return report
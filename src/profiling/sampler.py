@@ -0,0 +1,204 @@
+import cProfile, json, os, random, re, threading, time
+from typing import Any, Callable, Dict, Optional
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+def _safe(part: str) -> str:
+    return _UNSAFE.sub("_", str(part))[:64] or "_"
+
+def _flag(name: str, value: Any) -> Optional[bool]:
+    # JSON booleans only: bool("false") is True, so strings and numbers are rejected
+    if value is not None and not isinstance(value, bool):
+        raise TypeError(f"{name} must be true or false, got {value!r}")
+    return value
+
+def _limit(name: str, value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+    return value
+
+class RequestProfiler:
+    """Sampled per-request wall-clock / cProfile capture, off by default.
+
+    When disabled, call() costs one attribute check. When enabled, a `sample_rate`
+    fraction of requests is timed and appended to <out_dir>/requests.jsonl; with
+    `cprofile` on, each sampled request also writes a pstats file. Per-session
+    aggregates of the sampled wall time are kept in memory for status().
+    Output is capped at `max_bytes` / `max_files` (.prof files) in out_dir, counting
+    what is already there; once either is reached, samples are skipped, not written.
+    """
+
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    DEFAULT_MAX_FILES = 2000
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.cprofile = False
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+        # one cProfile at a time: newer Pythons reject concurrent profilers
+        self._cprofile_lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, float]] = {}
+        self._seen = 0
+        self._sampled = 0
+        self._record_errors = 0
+        self._last_record_error: Optional[str] = None
+        self.max_bytes = self.DEFAULT_MAX_BYTES
+        self.max_files = self.DEFAULT_MAX_FILES
+        self._bytes_used = 0
+        self._files_used = 0
+        self._skipped_cap = 0
+
+    def configure(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None,
+                  cprofile: Optional[bool] = None, out_dir: Optional[str] = None, reset: Optional[bool] = None,
+                  max_bytes: Optional[int] = None, max_files: Optional[int] = None) -> Dict[str, Any]:
+        # validate everything before applying anything, so a rejected call changes nothing
+        enabled = _flag("enabled", enabled)
+        cprofile = _flag("cprofile", cprofile)
+        reset = _flag("reset", reset)
+        max_bytes = _limit("max_bytes", max_bytes)
+        max_files = _limit("max_files", max_files)
+        if sample_rate is not None and (isinstance(sample_rate, bool) or not isinstance(sample_rate, (int, float))):
+            raise TypeError(f"sample_rate must be a number between 0 and 1, got {sample_rate!r}")
+        new_rate = self.sample_rate if sample_rate is None else max(0.0, min(1.0, float(sample_rate)))
+        new_dir = str(out_dir) if out_dir else self.out_dir
+        if enabled:
+            # fail at configure time rather than on every sampled request
+            try:
+                os.makedirs(new_dir, exist_ok=True)
+            except OSError as exc:
+                raise ValueError(f"profile out_dir {new_dir!r} is not usable: {exc}") from exc
+            if not os.access(new_dir, os.W_OK):
+                raise ValueError(f"profile out_dir {new_dir!r} is not writable")
+        # output from earlier runs in the same directory counts against the cap
+        bytes_used, files_used = self._scan_usage(new_dir)
+        with self._lock:
+            self.sample_rate = new_rate
+            self.out_dir = new_dir
+            self._bytes_used, self._files_used = bytes_used, files_used
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if max_files is not None:
+                self.max_files = max_files
+            if cprofile is not None:
+                self.cprofile = cprofile
+            if reset:
+                self._sessions.clear()
+                self._seen = 0
+                self._sampled = 0
+                self._record_errors = 0
+                self._last_record_error = None
+                self._skipped_cap = 0
+            if enabled is not None:
+                self.enabled = enabled
+        return self.status()
+
+    @staticmethod
+    def _scan_usage(out_dir: str):
+        """(bytes, .prof count) of profiler output already in out_dir."""
+        total = files = 0
+        try:
+            names = os.listdir(out_dir)
+        except OSError:
+            return 0, 0
+        for name in names:
+            if name.endswith(".prof") or name == "requests.jsonl":
+                try:
+                    total += os.path.getsize(os.path.join(out_dir, name))
+                except OSError:
+                    continue
+                files += name.endswith(".prof")
+        return total, files
+
+    def status(self, top_n: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            sessions = sorted(self._sessions.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)[:top_n]
+            return {
+                "enabled": self.enabled,
+                "sample_rate": self.sample_rate,
+                "cprofile": self.cprofile,
+                "out_dir": self.out_dir,
+                "requests_seen": self._seen,
+                "requests_sampled": self._sampled,
+                "record_errors": self._record_errors,
+                "last_record_error": self._last_record_error,
+                "max_bytes": self.max_bytes,
+                "max_files": self.max_files,
+                "bytes_used": self._bytes_used,
+                "files_used": self._files_used,
+                "skipped_over_cap": self._skipped_cap,
+                "sessions": [dict(session_id=sid, **agg) for sid, agg in sessions],
+            }
+
+    def call(self, session_id: str, turn_id: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        with self._lock:
+            self._seen += 1
+            sampled = self._rng.random() < self.sample_rate
+            if sampled and (self._bytes_used >= self.max_bytes or self._files_used >= self.max_files):
+                self._skipped_cap += 1
+                sampled = False
+        if not sampled:
+            return fn(*args, **kwargs)
+
+        prof = None
+        if self.cprofile and self._cprofile_lock.acquire(blocking=False):
+            prof = cProfile.Profile()
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        try:
+            try:
+                if prof is not None:
+                    prof.enable()
+                result = fn(*args, **kwargs)
+            finally:
+                if prof is not None:
+                    prof.disable()
+                wall_ms = (time.perf_counter() - wall0) * 1000.0
+                cpu_ms = (time.thread_time() - cpu0) * 1000.0
+            # profiling output is best-effort and must never fail the request
+            try:
+                self._record(session_id, turn_id, wall_ms, cpu_ms, prof)
+            except Exception as exc:  # noqa: BLE001 - diagnostics only
+                with self._lock:
+                    self._record_errors += 1
+                    self._last_record_error = f"{type(exc).__name__}: {exc}"
+        finally:
+            if prof is not None:
+                self._cprofile_lock.release()
+        return result
+
+    def _record(self, session_id: str, turn_id: str, wall_ms: float, cpu_ms: float, prof: Optional[cProfile.Profile]):
+        os.makedirs(self.out_dir, exist_ok=True)
+        profile_file = None
+        profile_bytes = 0
+        if prof is not None:
+            profile_file = f"{int(time.time() * 1000)}-{_safe(session_id)}-{_safe(turn_id)}.prof"
+            profile_path = os.path.join(self.out_dir, profile_file)
+            prof.dump_stats(profile_path)
+            profile_bytes = os.path.getsize(profile_path)
+        record = {
+            "ts": time.time(),
+            "session_id": session_id,
+            "turn_id": turn_id,
+            "wall_ms": wall_ms,
+            "cpu_ms": cpu_ms,
+            "profile_file": profile_file,
+        }
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._sampled += 1
+            # concurrent samples may each pass the cap check; the overshoot is at most one per thread
+            self._bytes_used += profile_bytes + len(line.encode("utf-8"))
+            self._files_used += profile_file is not None
+            agg = self._sessions.setdefault(session_id, {"samples": 0, "total_ms": 0.0, "max_ms": 0.0})
+            agg["samples"] += 1
+            agg["total_ms"] += wall_ms
+            agg["max_ms"] = max(agg["max_ms"], wall_ms)
+        # outside the lock: one short O_APPEND write per line, so concurrent writers don't interleave
+        with open(os.path.join(self.out_dir, "requests.jsonl"), "a", encoding="utf-8") as f:
+            f.write(line)
@@ -1,11 +1,14 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 from ..types.layer_output import LayerOutput
 from ..types.evidence import EvidenceSpan
+from ..types.records import LayerRecord, SpanRecord
 
-def collect_evidence(layers: List[LayerOutput]) -> List[EvidenceSpan]:
+def collect_evidence(layers: List[Union[LayerOutput, LayerRecord]]) -> List[EvidenceSpan]:
     ev: List[EvidenceSpan] = []
     for lo in layers:
-        ev.extend(lo.evidence)
+        for span in lo.evidence:
+            # internal records become public models here, at the event boundary
+            ev.append(span.to_model() if isinstance(span, SpanRecord) else span)
     return ev
 
 def dominant_layers(dvec: Dict[str, float], top_n: int = 2) -> List[str]:
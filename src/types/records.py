@@ -0,0 +1,61 @@
+from typing import List, Optional
+from .evidence import EvidenceSpan
+from .layer_output import LayerOutput
+
+# Internal hot-path records for the extractor -> engine pipeline.
+# Extractors emit these per match; they are converted to the public pydantic
+# models (EvidenceSpan / LayerOutput) only at the API boundary.
+
+class SpanRecord:
+    __slots__ = ("turn_id", "layer_id", "span_kind", "start", "end", "score", "confidence",
+                 "attribution_method_id", "extractor_version", "notes")
+
+    def __init__(self, turn_id: str, layer_id: str, span_kind: str, start: int, end: int, score: float,
+                 confidence: float, attribution_method_id: str, extractor_version: str, notes: Optional[str] = None):
+        self.turn_id = turn_id
+        self.layer_id = layer_id
+        self.span_kind = span_kind  # interned id prefix, e.g. "lex:caps"
+        self.start = start
+        self.end = end
+        self.score = score
+        self.confidence = confidence
+        self.attribution_method_id = attribution_method_id
+        self.extractor_version = extractor_version
+        self.notes = notes
+
+    @property
+    def span_id(self) -> str:
+        # formatted on demand; most turns never materialize evidence ids
+        return f"{self.turn_id}:{self.span_kind}:{self.start}"
+
+    def to_model(self) -> EvidenceSpan:
+        return EvidenceSpan(
+            span_id=self.span_id,
+            turn_id=self.turn_id,
+            layer_id=self.layer_id,
+            start=self.start,
+            end=self.end,
+            score=self.score,
+            confidence=self.confidence,
+            attribution_method_id=self.attribution_method_id,
+            extractor_version=self.extractor_version,
+            notes=self.notes,
+        )
+
+
+class LayerRecord:
+    __slots__ = ("layer_id", "score", "confidence", "evidence")
+
+    def __init__(self, layer_id: str, score: float, confidence: float, evidence: List[SpanRecord]):
+        self.layer_id = layer_id
+        self.score = score
+        self.confidence = confidence
+        self.evidence = evidence
+
+    def to_model(self) -> LayerOutput:
+        return LayerOutput(
+            layer_id=self.layer_id,
+            score=self.score,
+            confidence=self.confidence,
+            evidence=[s.to_model() for s in self.evidence],
+        )